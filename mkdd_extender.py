@@ -5,14 +5,18 @@ MKDD Extender is a tool that extends Mario Kart: Double Dash!! with 144 extra cu
 """
 import argparse
 import collections
+import concurrent.futures
 import configparser
 import contextlib
 import difflib
+import functools
 import hashlib
+import io
 import itertools
 import json
 import logging
 import math
+import mmap
 import os
 import platform
 import re
@@ -22,6 +26,7 @@ import subprocess
 import sys
 import tempfile
 import textwrap
+import threading
 import time
 import warnings
 import wave
@@ -39,6 +44,12 @@ with warnings.catch_warnings():
     warnings.filterwarnings("ignore", category=DeprecationWarning)
     import audioop  # Deprecated in Python 3.11.
 
+try:
+    import numpy
+    _NUMPY_AVAILABLE = True
+except ImportError:
+    _NUMPY_AVAILABLE = False
+
 __version__ = '2.2.1'
 
 LANGUAGES = ('English', 'French', 'German', 'Italian', 'Japanese', 'Spanish')
@@ -102,6 +113,11 @@ COURSE_TO_NAME = {
 Map from the course internal name to the course natural name.
 """
 
+NAME_TO_COURSE = {name: course for course, name in COURSE_TO_NAME.items()}
+"""
+Map from the course natural name to the course internal name.
+"""
+
 COURSE_TO_PREVIEW_IMAGE_NAME = {
     'BabyLuigi': 'baby_park',
     'Koopa': 'bowser_castle',
@@ -290,6 +306,8 @@ script_path = os.path.realpath(__file__)
 script_dir = os.path.dirname(script_path)
 tools_dir = os.path.join(script_dir, 'tools')
 data_dir = os.path.join(script_dir, 'data')
+wimgt_path = os.path.join(tools_dir, 'wimgt',
+                          'wimgt.exe' if windows else 'wimgt-mac' if macos else 'wimgt')
 
 TEMP_DIR_PREFIX = 'mkddext'
 
@@ -314,16 +332,6 @@ class MKDDExtenderCanceled(Exception):
     pass
 
 
-@contextlib.contextmanager
-def current_directory(dirpath):
-    cwd = os.getcwd()
-    try:
-        os.chdir(dirpath)
-        yield
-    finally:
-        os.chdir(cwd)
-
-
 def remove_file(filepath: str):
     try:
         os.remove(filepath)
@@ -342,6 +350,23 @@ def make_link(src_filepath: str, dst_filepath: str, attempt_copy_on_error: bool
             raise e
 
 
+def link_tree(src_dirpath: str, dst_dirpath: str):
+    # Equivalent to `shutil.copytree(src_dirpath, dst_dirpath, copy_function=make_link)`, but as the
+    # destination directory is new, files are linked straight away, without first attempting to
+    # remove a destination file that cannot exist.
+    os.makedirs(dst_dirpath)
+    with os.scandir(src_dirpath) as entries:
+        for entry in entries:
+            dst_path = os.path.join(dst_dirpath, entry.name)
+            if entry.is_dir():
+                link_tree(entry.path, dst_path)
+                continue
+            try:
+                os.link(entry.path, dst_path)
+            except OSError:
+                shutil.copyfile(entry.path, dst_path)
+
+
 def rename(src_path: str, dst_path: str):
     if src_path == dst_path:
         return
@@ -375,6 +400,21 @@ def rename(src_path: str, dst_path: str):
             raise RuntimeError(f'Rename "{src_path}" to "{dst_path}" failed: {error}') from e
 
 
+@contextlib.contextmanager
+def temporary_directory_with_deferred_removal():
+    # Similar to `tempfile.TemporaryDirectory`, except that, on success, the directory is removed
+    # in a background thread, as walking and unlinking the extracted ISO image can take several
+    # seconds. On failure, the directory is removed synchronously. The thread is not a daemon
+    # thread; the interpreter will wait for the removal to complete before exiting.
+    tmp_dir = tempfile.mkdtemp(prefix=TEMP_DIR_PREFIX)
+    try:
+        yield tmp_dir
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    threading.Thread(target=shutil.rmtree, args=(tmp_dir, True)).start()
+
+
 def clean_stale_temp_dirs():
     with tempfile.TemporaryDirectory(prefix=TEMP_DIR_PREFIX) as tmp_dir:
         user_tmp_dir = os.path.dirname(tmp_dir)
@@ -392,45 +432,93 @@ def run(command: list, verbose: bool = False, cwd: str = None) -> int:
     if windows:
         creationflags |= subprocess.CREATE_NO_WINDOW
 
+    # Output is only decoded when it is logged. The process never gets to read the standard input
+    # of the application.
     with subprocess.Popen(command,
+                          stdin=subprocess.DEVNULL,
                           stdout=subprocess.PIPE,
                           stderr=subprocess.PIPE,
                           cwd=cwd,
-                          text=True,
                           creationflags=creationflags) as process:
         output, errors = process.communicate()
         if output and (verbose or (process.returncode and not errors)):
-            log.info(output)
+            log.info(output.decode('utf-8', errors='replace'))
         if errors:
-            log.error(errors)
+            log.error(errors.decode('utf-8', errors='replace'))
         return process.returncode
 
 
+def run_concurrently(function: callable, tasks: 'list[tuple]', raise_if_canceled: callable) -> int:
+    # Calls the function with each tuple of arguments in a thread pool. Cancellation is checked as
+    # each task completes; pending tasks are canceled if an error occurs. Returns the number of
+    # tasks completed.
+    completed = 0
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        futures = tuple(executor.submit(function, *args) for args in tasks)
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                future.result()
+                completed += 1
+                raise_if_canceled()
+        except BaseException:
+            executor.shutdown(cancel_futures=True)
+            raise
+    return completed
+
+
 def md5sum(filepath: str) -> str:
-    return hashlib.md5(open(filepath, 'rb').read()).hexdigest()
+    with open(filepath, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+            return hashlib.file_digest(f, 'md5').hexdigest()
+        md5 = hashlib.md5()
+        buffer = bytearray(1024 * 1024)
+        view = memoryview(buffer)
+        while size := f.readinto(buffer):
+            md5.update(view[:size])
+        return md5.hexdigest()
 
 
 def build_file_list(dirpath: str) -> 'tuple[str]':
 
-    def _build_file_list(dirpath):
+    # Paths are relative to the given directory. The file type is taken from the directory entry,
+    # which (on most platforms) does not require an additional `stat` call per entry.
+    def _build_file_list(relpath):
         result = []
-        for name in sorted(os.listdir(dirpath) if dirpath else os.listdir()):
-            path = os.path.normpath(os.path.join(dirpath, name))
+        with os.scandir(os.path.join(dirpath, relpath)) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+        for entry in entries:
+            path = os.path.normpath(os.path.join(relpath, entry.name))
             result.append(path)
-            if os.path.isdir(path):
+            if entry.is_dir():
                 result.extend(_build_file_list(path))
         return tuple(result)
 
-    with current_directory(dirpath):
-        return _build_file_list('')
+    return _build_file_list('')
+
+
+def build_file_list_from_gcm(gcm_file: gcm.GCM) -> 'tuple[str]':
+    # Equivalent to `build_file_list()` on a directory to which the given image has just been
+    # extracted: the files in the image, and the directories that contain them (empty directories
+    # are not extracted), in the same order.
+    paths = set()
+    for file_path in gcm_file.files_by_path:
+        paths.add(file_path)
+        dirpath = os.path.dirname(file_path)
+        while dirpath and dirpath not in paths:
+            paths.add(dirpath)
+            dirpath = os.path.dirname(dirpath)
+    return tuple(sorted(paths, key=lambda path: path.split(os.sep)))
 
 
 def get_custom_track_name(path: str) -> str:
 
-    def name_from_trackinfo(trackinfo_filepath: str) -> str:
+    def name_from_trackinfo(trackinfo_file: 'str | io.TextIOBase') -> str:
         trackinfo = configparser.ConfigParser()
         try:
-            trackinfo.read(trackinfo_filepath)
+            if isinstance(trackinfo_file, str):
+                trackinfo.read(trackinfo_file)
+            else:
+                trackinfo.read_file(trackinfo_file)
             name = trackinfo['Config']['trackname']
             name = name.strip().lstrip('🎈').strip()
             course = course_name_to_course(trackinfo['Config']['replaces'])
@@ -458,14 +546,12 @@ def get_custom_track_name(path: str) -> str:
                 if os.path.basename(name) == 'trackinfo.ini':
                     trackinfo_entries.append(name)
 
-            # Only accepted if there is a single entry.
+            # Only accepted if there is a single entry. The entry is read straight from the archive
+            # (decoded with the same default encoding that would be used for a file on disk).
             if len(trackinfo_entries) == 1:
                 trackinfo_entry = trackinfo_entries[0]
-                with tempfile.TemporaryDirectory(prefix=TEMP_DIR_PREFIX) as tmp_dir:
-                    f.extract(trackinfo_entry, tmp_dir)
-                    f.close()
-
-                    return name_from_trackinfo(os.path.join(tmp_dir, trackinfo_entry))
+                with f.open(trackinfo_entry) as entry_file:
+                    return name_from_trackinfo(io.TextIOWrapper(entry_file))
 
     return str()
 
@@ -502,18 +588,24 @@ def extract_and_flatten(src_path: str, dst_dirpath: str):
     # it will be unwrapped. If the archive contains a nested archive, it will be extracted too.
     with tempfile.TemporaryDirectory(prefix=TEMP_DIR_PREFIX) as tmp_dir:
         if os.path.isfile(src_path):
-            shutil.unpack_archive(src_path, tmp_dir)
+            with zipfile.ZipFile(src_path) as zip_file:
+                zip_file.extractall(tmp_dir)
         else:
             shutil.copytree(src_path, os.path.join(tmp_dir, os.path.basename(src_path)))
 
         paths = tuple(os.path.join(tmp_dir, p) for p in os.listdir(tmp_dir))
 
         while len(paths) == 1:
-            # If there is only one entry, and it's another archive, apply action recursively.
+            # If there is only one entry, and it's another archive, extract it too (into a new
+            # directory in the same temporary directory), discarding the nested archive right away.
             path = paths[0]
             if path.endswith('.zip') and os.path.isfile(path):
-                extract_and_flatten(path, dst_dirpath)
-                return
+                nested_dirpath = tempfile.mkdtemp(dir=tmp_dir)
+                with zipfile.ZipFile(path) as zip_file:
+                    zip_file.extractall(nested_dirpath)
+                os.remove(path)
+                paths = tuple(os.path.join(nested_dirpath, p) for p in os.listdir(nested_dirpath))
+                continue
 
             # If there is only one entry, and it's a directory, make it current.
             if os.path.isdir(path):
@@ -554,32 +646,61 @@ def unwrap_custom_track(dirpath: str):
         shutil.move(os.path.join(tmp_dir, os.path.basename(nested_dirpath)), dirpath)
 
 
+@functools.lru_cache(maxsize=None)
 def course_name_to_course(course_name: str) -> str:
+    # Exact names are resolved right away.
+    course = NAME_TO_COURSE.get(course_name)
+    if course is not None:
+        return course
+
     # A distance between strings is used for the comparison, as there are some courses names that
-    # are often used inaccurately (e.g. missing apostrophe in Bowser's Castle).
-    courses_weight = [(course, difflib.SequenceMatcher(None, other_course_name,
-                                                       course_name).ratio())
-                      for course, other_course_name in COURSE_TO_NAME.items()]
-    return sorted(courses_weight, key=lambda e: e[1])[-1][0]
+    # are often used inaccurately (e.g. missing apostrophe in Bowser's Castle). On ties, the last
+    # course wins (hence the reversed order).
+    return max(reversed(COURSE_TO_NAME.items()),
+               key=lambda e: difflib.SequenceMatcher(None, e[1], course_name).ratio())[0]
 
 
-def get_tilt_setting_from_bol_file(course_filepath: str) -> int:
+@contextlib.contextmanager
+def map_file(f, access: int):
+    # Memory-maps the given file object. Empty files cannot be mapped; an empty buffer is yielded.
+    if not os.fstat(f.fileno()).st_size:
+        yield b''
+        return
+    with mmap.mmap(f.fileno(), 0, access=access) as data:
+        yield data
+
+
+def find_bol_offset_in_rarc_data(data) -> int:
+    # Returns the offset of the BOL file in the given RARC archive data, or -1 if the archive is
+    # compressed (or the BOL file cannot be located in the archive).
     BOL_MAGIC = b'0015'
-    TILT_SETTING_OFFSET = 0x04
 
-    with open(course_filepath, 'rb') as f:
-        data = f.read()
+    if data[:4] != b'RARC':
+        return -1
 
-    # If the start of the BOL file can be located [once] in the RARC archive, the BOL file can be
+    # The BOL file is looked up in the entries of the archive; only the headers need to be read.
+    bol_offset = rarc.find_file_offset(data, lambda name: name.endswith(b'.bol'))
+    if bol_offset > 0 and data[bol_offset:bol_offset + len(BOL_MAGIC)] == BOL_MAGIC:
+        return bol_offset
+
+    # Otherwise, the archive is scanned for the magic, which is only trusted if it is unique.
+    bol_offset = data.find(BOL_MAGIC)
+    if bol_offset > 0 and data.find(BOL_MAGIC, bol_offset + len(BOL_MAGIC)) < 0:
+        return bol_offset
+
+    return -1
+
+
+def get_tilt_setting_from_bol_file(course_filepath: str) -> int:
+    TILT_SETTING_OFFSET = 0x04
+
+    # If the start of the BOL file can be located in the RARC archive, the BOL file can be
     # read directly without having to extract the archive first, which would be slower. This
     # shortcut only possible if the RARC file is uncompressed.
-    if data[:4] == b'RARC':
-        bol_offset = data.find(BOL_MAGIC)
+    with open(course_filepath, 'rb') as f, map_file(f, mmap.ACCESS_READ) as data:
+        bol_offset = find_bol_offset_in_rarc_data(data)
         if bol_offset > 0:
-            if data.find(BOL_MAGIC, bol_offset + len(BOL_MAGIC)) < 0:
-                with open(course_filepath, 'r+b') as f:
-                    f.seek(bol_offset + TILT_SETTING_OFFSET)
-                    return f.read(1)[0]
+            return data[bol_offset + TILT_SETTING_OFFSET]
 
     # Otherwise, extract the RARC file, and locate the BOL file in the directory.
     with tempfile.TemporaryDirectory(prefix=TEMP_DIR_PREFIX) as tmp_dir:
@@ -605,23 +726,16 @@ def patch_music_id_in_bol_file(course_filepath: str, track_index: int):
 
     music_id = MUSIC_IDS[track_index]
 
-    BOL_MAGIC = b'0015'
     MUSIC_ID_OFFSET = 0x19  # https://wiki.tockdom.com/wiki/BOL_(File_Format)
 
-    with open(course_filepath, 'rb') as f:
-        data = f.read()
-
-    # If the start of the BOL file can be located [once] in the RARC archive, the BOL file can be
+    # If the start of the BOL file can be located in the RARC archive, the BOL file can be
     # edited directly without having to extract the archive first, which would be slower. This
     # shortcut only possible if the RARC file is uncompressed.
-    if data[:4] == b'RARC':
-        bol_offset = data.find(BOL_MAGIC)
+    with open(course_filepath, 'r+b') as f, map_file(f, mmap.ACCESS_WRITE) as data:
+        bol_offset = find_bol_offset_in_rarc_data(data)
         if bol_offset > 0:
-            if data.find(BOL_MAGIC, bol_offset + len(BOL_MAGIC)) < 0:
-                with open(course_filepath, 'r+b') as f:
-                    f.seek(bol_offset + MUSIC_ID_OFFSET)
-                    f.write(bytes([music_id]))
-                return
+            data[bol_offset + MUSIC_ID_OFFSET] = music_id
+            return
 
     # Otherwise, extract the RARC file, locate the BOL file in the directory, patch the BOL file,
     # and re-pack the RARC archive.
@@ -687,8 +801,6 @@ def convert_bti_to_image(filepath: str) -> Image.Image:
         filename = os.path.basename(filepath)
         tmp_filepath = os.path.join(tmp_dir, filename[:-len('.bti')] + '.png')
 
-        wimgt_name = 'wimgt.exe' if windows else 'wimgt-mac' if macos else 'wimgt'
-        wimgt_path = os.path.join(tools_dir, 'wimgt', wimgt_name)
         command = (wimgt_path, 'decode', filepath, '-o', '-d', tmp_filepath)
 
         try:
@@ -703,13 +815,40 @@ def convert_bti_to_image(filepath: str) -> Image.Image:
         return None
 
 
+# Decoded images, keyed by the checksum of the BTI file. Some images are decoded several times
+# (e.g. cup name images, which are identical in every page). The map is only populated while a
+# build is in progress; `extend_game()` clears it once the images have been patched.
+BTI_IMAGE_MAP = {}
+
+
+def convert_bti_to_image_cached(filepath: str) -> Image.Image:
+    checksum = md5sum(filepath)
+    image = BTI_IMAGE_MAP.get(checksum)
+    if image is None:
+        image = convert_bti_to_image(filepath)
+        if image is None:
+            raise RuntimeError(f'Error occurred while converting image file ("{filepath}").')
+        BTI_IMAGE_MAP[checksum] = image
+    return image.copy()
+
+
+# Images in the data directory, converted to RGBA. They are read-only; callers must not modify them.
+DATA_IMAGE_MAP = {}
+
+
+def load_data_image(*path_components: str) -> Image.Image:
+    image = DATA_IMAGE_MAP.get(path_components)
+    if image is None:
+        image = Image.open(os.path.join(data_dir, *path_components)).convert('RGBA')
+        DATA_IMAGE_MAP[path_components] = image
+    return image
+
+
 def convert_bti_to_png(src_filepath: str, dst_filepath: str):
     assert src_filepath.endswith('.bti')
 
     os.makedirs(os.path.dirname(dst_filepath), exist_ok=True)
 
-    wimgt_name = 'wimgt.exe' if windows else 'wimgt-mac' if macos else 'wimgt'
-    wimgt_path = os.path.join(tools_dir, 'wimgt', wimgt_name)
     command = (wimgt_path, 'decode', src_filepath, '-o', '-d', dst_filepath)
 
     if 0 != run(command) or not os.path.isfile(dst_filepath):
@@ -725,8 +864,6 @@ def convert_png_to_bti(src_filepath: str, dst_filepath: str, image_format: str):
 
     os.makedirs(os.path.dirname(dst_filepath), exist_ok=True)
 
-    wimgt_name = 'wimgt.exe' if windows else 'wimgt-mac' if macos else 'wimgt'
-    wimgt_path = os.path.join(tools_dir, 'wimgt', wimgt_name)
     command = (wimgt_path, 'encode', src_filepath, '--n-mipmaps=0', '-o', '-d', dst_filepath, '-x',
                f'BTI.{image_format}')
 
@@ -756,15 +893,14 @@ def extract_bti_wrap_values(filepath: str) -> 'tuple[int, int]':
 
 
 def copy_or_link_bti_image(src_filepath: str, dst_filepath: str):
+    # The source file is a scratch file (it lives in the temporary directory of the custom course),
+    # so its wrap values can be zeroed in place; that way the destination can always be a hard link,
+    # even when the same image is used in several languages, or in several directories.
     wrap_st = extract_bti_wrap_values(src_filepath)
-    if wrap_st == (0x00, 0x00):
-        make_link(src_filepath, dst_filepath)
-        return
+    if wrap_st != (0x00, 0x00):
+        zero_bti_wrap_values(src_filepath)
 
-    remove_file(dst_filepath)  # It may be a hard link; unlink early.
-
-    shutil.copyfile(src_filepath, dst_filepath)
-    zero_bti_wrap_values(dst_filepath)
+    make_link(src_filepath, dst_filepath)
 
 
 def conform_bti_image(filepath: str, width: int, height: int, image_format: str):
@@ -801,7 +937,7 @@ def crop_image_sides(image: Image.Image) -> Image.Image:
     return image.crop(bbox)
 
 
-def split_image(image: Image.Image) -> 'list[Image.Image]':
+def split_image_naive(image: Image.Image) -> 'list[Image.Image]':
     image = crop_image_sides(image)
 
     width = image.width
@@ -814,27 +950,58 @@ def split_image(image: Image.Image) -> 'list[Image.Image]':
                 break
         else:
             left_image = image.crop((0, 0, w, height))
-            right_images = split_image(image.crop((w + 1, 0, width, height)))
+            right_images = split_image_naive(image.crop((w + 1, 0, width, height)))
             return [left_image] + right_images
 
     return [image]
 
 
+def split_image_numpy(image: Image.Image) -> 'list[Image.Image]':
+    # Splits the image at its fully transparent columns (after cropping the sides, as done in
+    # `crop_image_sides()`).
+    pixels = numpy.asarray(image)
+    opaque_columns = pixels[:, :, 3].any(axis=0)
+    nonempty_columns = pixels.any(axis=(0, 2))
+
+    height = image.height
+    images = []
+    start, end = 0, image.width
+
+    while True:
+        opaque_indices = numpy.flatnonzero(opaque_columns[start:end])
+        if not opaque_indices.size:
+            break
+        left = start + int(opaque_indices[0])
+        right = start + int(opaque_indices[-1]) + 1
+
+        empty_indices = numpy.flatnonzero(~nonempty_columns[left:right])
+        if not empty_indices.size:
+            images.append(image.crop((left, 0, right, height)))
+            break
+
+        w = left + int(empty_indices[0])
+        images.append(image.crop((left, 0, w, height)))
+        start, end = w + 1, right
+
+    return images
+
+
+if _NUMPY_AVAILABLE:
+    split_image = split_image_numpy
+else:
+    split_image = split_image_naive
+
+
 def add_controls_to_title_image(filepath: str, language: str, use_alternative_buttons: bool):
     with tempfile.TemporaryDirectory(prefix=TEMP_DIR_PREFIX) as tmp_dir:
         title_filename = os.path.basename(filepath)
         tmp_filepath = os.path.join(tmp_dir, title_filename[:-len('.bti')] + '.png')
 
-        convert_bti_to_png(filepath, tmp_filepath)
-
         controls_filename = 'yx_buttons.png' if use_alternative_buttons else 'dpad_up_down.png'
-        controls_filepath = os.path.join(data_dir, 'controls', controls_filename)
-        controls_image = Image.open(controls_filepath)
-        slash_filepath = os.path.join(data_dir, 'controls', 'slash.png')
-        slash_image = Image.open(slash_filepath)
-        slash_image = slash_image.convert('RGBA')
+        controls_image = load_data_image('controls', controls_filename)
+        slash_image = load_data_image('controls', 'slash.png')
 
-        title_image = Image.open(tmp_filepath)
+        title_image = convert_bti_to_image_cached(filepath)
         title_image = title_image.convert('RGBA')
 
         canvas_width = title_image.width
@@ -873,7 +1040,10 @@ def add_controls_to_title_image(filepath: str, language: str, use_alternative_bu
         convert_png_to_bti(tmp_filepath, filepath, 'IA4')
 
 
+@functools.lru_cache(maxsize=64)
 def build_page_numbers_image(page_number: int, page_count: int) -> Image.Image:
+    # The same few images are requested for every cup and language; the returned image is shared,
+    # and must not be modified.
     image, _overflow = build_text_image_from_bitmap_font(f'{page_number}/{page_count}', 80, 16, 2,
                                                          0, 0.6, 0.5)
     image = crop_image_sides(image)
@@ -886,9 +1056,7 @@ def add_page_number_to_cup_name_image(filepath: str, page_number: int, page_coun
         cupname_filename = os.path.basename(filepath)
         tmp_filepath = os.path.join(tmp_dir, cupname_filename[:-len('.bti')] + '.png')
 
-        convert_bti_to_png(filepath, tmp_filepath)
-
-        cupname_image = Image.open(tmp_filepath)
+        cupname_image = convert_bti_to_image_cached(filepath)
         original_mode = cupname_image.mode  # Original mode is 'LA'.
         cupname_image = cupname_image.convert('RGBA')
         canvas_width = cupname_image.width
@@ -928,9 +1096,7 @@ def add_page_number_to_preview_image(filepath: str, page_number: int, page_count
         cupname_filename = os.path.basename(filepath)
         tmp_filepath = os.path.join(tmp_dir, cupname_filename[:-len('.bti')] + '.png')
 
-        convert_bti_to_png(filepath, tmp_filepath)
-
-        preview_image = Image.open(tmp_filepath)
+        preview_image = convert_bti_to_image_cached(filepath)
         original_mode = preview_image.mode
         preview_image = preview_image.convert('RGBA')
         canvas_width = preview_image.width
@@ -957,6 +1123,7 @@ CHARACTERS = ('0', '1', '2', '3', '4', '5', '6', '7', '8', '9', '+', '-', ':', '
 CHARACTER_SET = set(CHARACTERS)
 CHARACTER_INDEX = {c: i for i, c in enumerate(CHARACTERS)}
 CHARACTER_IMAGE_MAP = {}
+SCALED_CHARACTER_IMAGE_MAP = {}
 CHARACTER_DEFAULT_PADDING = 8
 CHARACTER_PADDING_REMOVAL = {
     ':': (3, 3),
@@ -1043,9 +1210,14 @@ def build_text_image_from_bitmap_font(text: str, width: int, height: int, charac
             if (horizontal_scaling, vertical_scaling) != (1.0, 1.0):
                 new_width = max(1, round(character_image.width * horizontal_scaling))
                 new_height = max(1, round(character_image.height * vertical_scaling))
-                character_image = character_image.resize((new_width, new_height),
-                                                         resample=RESAMPLING_FILTER,
-                                                         reducing_gap=3.0)
+                # The same glyphs are scaled to the same sizes over and over (e.g. page numbers).
+                key = (c, new_width, new_height)
+                if key not in SCALED_CHARACTER_IMAGE_MAP:
+                    scaled_character_image = character_image.resize((new_width, new_height),
+                                                                    resample=RESAMPLING_FILTER,
+                                                                    reducing_gap=3.0)
+                    SCALED_CHARACTER_IMAGE_MAP[key] = scaled_character_image
+                character_image = SCALED_CHARACTER_IMAGE_MAP[key]
 
             character_image.character = c
 
@@ -1054,20 +1226,22 @@ def build_text_image_from_bitmap_font(text: str, width: int, height: int, charac
         if word_images:
             image_groups.append(word_images)
 
+    # Character images are shared (cached); spacing overrides are tracked by position instead.
+    character_spacing_overrides = {}
     required_width = 0
     if word_spacing > 0 and image_groups:
         required_width += word_spacing * (len(image_groups) - 1)
-    for word_images in image_groups:
+    for i, word_images in enumerate(image_groups):
         for image in word_images:
             required_width += image.width
         if character_spacing > 0 and word_images:
             required_width += character_spacing * (len(word_images) - 1)
-        for prev_character_image, character_image in zip(word_images, word_images[1:]):
-            prev_c = prev_character_image.character
-            c = character_image.character
+        for j in range(1, len(word_images)):
+            prev_c = word_images[j - 1].character
+            c = word_images[j].character
             if (c in JAPANESE_CHARACTER_SET) != (prev_c in JAPANESE_CHARACTER_SET):
                 required_width += JAPANESE_CHARACTER_SPACING_OVERRIDE - character_spacing
-                character_image.character_spacing_override = JAPANESE_CHARACTER_SPACING_OVERRIDE
+                character_spacing_overrides[(i, j)] = JAPANESE_CHARACTER_SPACING_OVERRIDE
     required_height = (image_groups[0][0].height if image_groups[0] else 0) if image_groups else 0
     if required_width < 1 or required_height < 1:
         return Image.new('RGBA', (width, height)), False
@@ -1077,8 +1251,8 @@ def build_text_image_from_bitmap_font(text: str, width: int, height: int, charac
     for i, word_images in enumerate(image_groups):
         offset += word_spacing if i else 0
         for j, character_image in enumerate(word_images):
-            if hasattr(character_image, 'character_spacing_override'):
-                offset += character_image.character_spacing_override
+            if (i, j) in character_spacing_overrides:
+                offset += character_spacing_overrides[(i, j)]
             else:
                 offset += character_spacing if j else 0
             ops.append((character_image, (offset, 0)))
@@ -1170,16 +1344,32 @@ def generate_bti_image_from_bitmap_font(text: str,
 
         line_image_width = width - margin * 2
 
-        # Iteratively find a scale that makes the line fit in the image of the requested dimensions.
-        for scale in range(100, 40, -1):
+        # Binary search for the largest scale (down to 41%) that makes the line fit in the image of
+        # the requested dimensions; the line grows with the scale. Most lines fit at full scale,
+        # which is therefore probed first.
+        line_image = None
+        low, high = 40, 100
+        image, overflow = build_text_image_from_bitmap_font(line, line_image_width,
+                                                            line_image_height, *spacing, 1.0,
+                                                            vertical_scale)
+        if overflow:
+            high -= 1
+        else:
+            low = high
+            line_image = image
+        while low < high:
+            scale = (low + high + 1) // 2
             image, overflow = build_text_image_from_bitmap_font(line, line_image_width,
                                                                 line_image_height, *spacing,
                                                                 scale / 100, vertical_scale)
-            if not overflow:
-                line_images.append((image, margin))
-                break
-        else:
+            if overflow:
+                high = scale - 1
+            else:
+                low = scale
+                line_image = image
+        if line_image is None:
             break
+        line_images.append((line_image, margin))
 
     if len(line_images) == len(lines):
         image_with_background = Image.new('RGBA', (width, height), background)
@@ -1231,7 +1421,7 @@ def generate_bti_image(text: str, width: int, height: int, image_format: str,
     HORIZNOTAL_MARGIN = 1
     VERTICAL_MARGIN = 1
 
-    for size in range(2, 100):
+    def measure(size: int) -> 'tuple[int, int]':
         font = ImageFont.truetype(font_filepath, size)
         stroke_width = max(3, size // 10)
         left, top, right, bottom = draw.textbbox((width // 2, height // 2),
@@ -1239,13 +1429,38 @@ def generate_bti_image(text: str, width: int, height: int, image_format: str,
                                                  font=font,
                                                  anchor='mm',
                                                  stroke_width=stroke_width)
-        w = right - left
-        h = bottom - top
-        if w + HORIZNOTAL_MARGIN >= width or h + VERTICAL_MARGIN >= height:
-            size -= 1
-            font = ImageFont.truetype(font_filepath, size)
-            stroke_width = max(3, size // 10)
-            break
+        return right - left, bottom - top
+
+    def fits(size: int) -> bool:
+        w, h = measure(size)
+        return w + HORIZNOTAL_MARGIN < width and h + VERTICAL_MARGIN < height
+
+    # The text dimensions are roughly proportional to the font size; a measurement at a reference
+    # size provides an estimate of the largest size that fits, which is probed first (along with
+    # its neighbors) to narrow down the range of the search.
+    REFERENCE_SIZE = 50
+    w, h = measure(REFERENCE_SIZE)
+    estimate = math.floor(REFERENCE_SIZE * min(width / max(1, w), height / max(1, h)))
+    estimate = min(max(estimate, 1), 99)
+
+    # Binary search for the largest font size (up to 99) that fits; the text grows with the size.
+    # If not even the smallest size fits, 1 is used.
+    low, high = 1, 99
+    for size in (estimate, estimate + 1, estimate - 1):
+        if low < size <= high:
+            if fits(size):
+                low = size
+            else:
+                high = size - 1
+    while low < high:
+        size = (low + high + 1) // 2
+        if fits(size):
+            low = size
+        else:
+            high = size - 1
+    size = low
+    font = ImageFont.truetype(font_filepath, size)
+    stroke_width = max(3, size // 10)
 
     # NOTE: Besides the efforts to draw the text in the middle of the image, it's still slightly
     # misaligned. This could be Pillow's fault, or flaws in the font file. To ensure that it's
@@ -1269,11 +1484,9 @@ def generate_bti_image(text: str, width: int, height: int, image_format: str,
     offset_x = (width - text_image.size[0]) // 2
     offset_y = (height - text_image.size[1]) // 2
 
-    tmp_image = Image.new('RGBA', (width, height))
-    tmp_image.paste(text_image, (offset_x, offset_y))
-
+    # Only the region covered by the text is composited; the rest of the background is untouched.
     image = Image.new('RGBA', (width, height), background)
-    image = Image.alpha_composite(image, tmp_image)
+    image.alpha_composite(text_image, dest=(offset_x, offset_y))
 
     with tempfile.TemporaryDirectory(prefix=TEMP_DIR_PREFIX) as tmp_dir:
         tmp_filepath = os.path.join(tmp_dir,
@@ -1285,6 +1498,32 @@ def generate_bti_image(text: str, width: int, height: int, image_format: str,
         convert_png_to_bti(tmp_filepath, filepath, image_format)
 
 
+def mix_channels_to_mono_naive(data: bytes, bit_depth: int, channel_count: int) -> bytes:
+    if channel_count == 4:
+        data = audioop.tomono(data, bit_depth // 8, 1.0, 1.0)
+    return audioop.tomono(data, bit_depth // 8, 1.0, 1.0)
+
+
+def mix_channels_to_mono_numpy(data: bytes, bit_depth: int, channel_count: int) -> bytes:
+    # Channels are mixed in a single vectorized pass. As with `audioop.tomono()`, adjacent channels
+    # are summed pairwise, saturating at each step (4 -> 2 -> 1).
+    sample_dtype = numpy.dtype(f'<i{bit_depth // 8}')
+    sample_min = numpy.iinfo(sample_dtype).min
+    sample_max = numpy.iinfo(sample_dtype).max
+
+    samples = numpy.frombuffer(data, dtype=sample_dtype).astype(numpy.int64)
+    samples = samples.reshape(-1, channel_count)
+    while samples.shape[1] > 1:
+        samples = numpy.clip(samples[:, 0::2] + samples[:, 1::2], sample_min, sample_max)
+    return samples.astype(sample_dtype).tobytes()
+
+
+if _NUMPY_AVAILABLE:
+    mix_channels_to_mono = mix_channels_to_mono_numpy
+else:
+    mix_channels_to_mono = mix_channels_to_mono_naive
+
+
 def conform_audio_file(filepath: str, mix_to_mono: bool, downsample_sample_rate: int):
     if not mix_to_mono and not downsample_sample_rate:
         return
@@ -1312,31 +1551,40 @@ def conform_audio_file(filepath: str, mix_to_mono: bool, downsample_sample_rate:
                                     os.path.splitext(os.path.basename(filepath))[0] + '.wav')
         ast_converter.convert_to_wav(filepath, wav_filepath)
 
-        with wave.open(wav_filepath, 'rb') as f:
-            real_sample_count = f.getnframes()
-            data = f.readframes(real_sample_count)
+        conformed_wav_filepath = os.path.join(tmp_dir, 'conformed.wav')
 
+        src_channel_count = channel_count
         if needs_mixing:
-            if channel_count == 4:
-                data = audioop.tomono(data, bit_depth // 8, 1.0, 1.0)
-                channel_count = 2
-            if channel_count == 2:
-                data = audioop.tomono(data, bit_depth // 8, 1.0, 1.0)
-                channel_count = 1
+            channel_count = 1
 
+        src_sample_rate = sample_rate
         sample_rate_ratio = 1
         if needs_downsampling:
-            data, _state = audioop.ratecv(data, bit_depth // 8, channel_count, sample_rate,
-                                          downsample_sample_rate, None)
             sample_rate_ratio = downsample_sample_rate / sample_rate
             sample_rate = downsample_sample_rate
 
-        with wave.open(wav_filepath, 'wb') as f:
+        # The samples are converted in chunks, streamed from one WAV file into the other, so that
+        # the entire audio track is never held in memory (the resampling state is carried over).
+        CHUNK_FRAME_COUNT = 256 * 1024
+
+        with wave.open(wav_filepath, 'rb') as src_f, \
+                wave.open(conformed_wav_filepath, 'wb') as f:
             f: wave.Wave_write
             f.setsampwidth(bit_depth // 8)
             f.setnchannels(channel_count)
             f.setframerate(sample_rate)
-            f.writeframes(data)
+
+            state = None
+            while data := src_f.readframes(CHUNK_FRAME_COUNT):
+                if needs_mixing:
+                    data = mix_channels_to_mono(data, bit_depth, src_channel_count)
+
+                if needs_downsampling:
+                    data, state = audioop.ratecv(data, bit_depth // 8, channel_count,
+                                                 src_sample_rate, sample_rate, state)
+
+                f.writeframesraw(data)
+
             new_real_sample_count = f.getnframes()
 
         sample_count = ast_info['sample_count']
@@ -1352,7 +1600,7 @@ def conform_audio_file(filepath: str, mix_to_mono: bool, downsample_sample_rate:
 
         remove_file(filepath)  # It may be a hard link; unlink early.
 
-        ast_converter.convert_to_ast(wav_filepath,
+        ast_converter.convert_to_ast(conformed_wav_filepath,
                                      filepath,
                                      looped=ast_info['looped'],
                                      sample_count=sample_count,
@@ -1366,79 +1614,77 @@ def patch_bnr_file(iso_tmp_dir: str):
     files_dirpath = os.path.join(iso_tmp_dir, 'files')
     bnr_filepath = os.path.join(files_dirpath, 'opening.bnr')
 
-    checksum = md5sum(bnr_filepath)
-    if checksum == '1b187557206eb4ea072a4882f37a4966':
-        region = 'E'
-    elif checksum == '953470f151856f512fc08ef36cc872e6':
-        region = 'P'
-    elif checksum == 'a5315f8bdd9bc56331bac1a6af5e195c':
-        region = 'J'
-    else:
-        region = None
+    # The BNR file is read once; the patched regions are then written in place.
+    with open(bnr_filepath, 'r+b') as f:
+        data = f.read()
 
-    # Replace the image data with the pre-generated raw data. The raw data was generated with the
-    # `bnrparser.py` tool (part of pyisotools), after converting the `banner.png` file and isolating
-    # the image data (bytes between 0x0020 and 0x1820).
+        checksum = hashlib.md5(data).hexdigest()
+        if checksum == '1b187557206eb4ea072a4882f37a4966':
+            region = 'E'
+        elif checksum == '953470f151856f512fc08ef36cc872e6':
+            region = 'P'
+        elif checksum == 'a5315f8bdd9bc56331bac1a6af5e195c':
+            region = 'J'
+        else:
+            region = None
 
-    log.info(f'Replacing banner image in BNR file ("{bnr_filepath}")...')
+        # Replace the image data with the pre-generated raw data. The raw data was generated with
+        # the `bnrparser.py` tool (part of pyisotools), after converting the `banner.png` file and
+        # isolating the image data (bytes between 0x0020 and 0x1820).
 
-    raw_filepath = os.path.join(data_dir, 'banner', 'banner.raw')
-    with open(raw_filepath, 'rb') as f:
-        raw_data = f.read()
+        log.info(f'Replacing banner image in BNR file ("{bnr_filepath}")...')
 
-    IMAGE_OFFSET = 0x0020
-    IMAGE_LENGTH = 0x1800
+        raw_filepath = os.path.join(data_dir, 'banner', 'banner.raw')
+        with open(raw_filepath, 'rb') as raw_file:
+            raw_data = raw_file.read()
+
+        IMAGE_OFFSET = 0x0020
+        IMAGE_LENGTH = 0x1800
 
-    with open(bnr_filepath, 'r+b') as f:
         f.seek(IMAGE_OFFSET)
         f.write(raw_data)
         assert f.tell() == IMAGE_OFFSET + IMAGE_LENGTH
 
-    log.info('Banner image replaced.')
+        log.info('Banner image replaced.')
 
-    if region is None:
-        log.warning('Unrecognized BNR file. Game title will not be modified.')
-        return
-
-    log.info(f'Tweaking game title in BNR file ("{bnr_filepath}")...')
-
-    # If the BNR file is an original, "Extended!!" will be appended to the game title (or titles, in
-    # the PAL version).
+        if region is None:
+            log.warning('Unrecognized BNR file. Game title will not be modified.')
+            return
 
-    with open(bnr_filepath, 'rb') as f:
-        data = bytearray(f.read())
+        log.info(f'Tweaking game title in BNR file ("{bnr_filepath}")...')
 
-    TITLE_OFFSET = 0x1860
-    NEXT_TITLE_OFFSET_STEP = 0x0140
+        # If the BNR file is an original, "Extended!!" will be appended to the game title (or
+        # titles, in the PAL version).
 
-    title_offsets = []
-    for title_offset in range(TITLE_OFFSET, len(data), NEXT_TITLE_OFFSET_STEP):
-        title_offsets.append(title_offset)
+        TITLE_OFFSET = 0x1860
+        NEXT_TITLE_OFFSET_STEP = 0x0140
 
-    if region != 'J':
-        EXCLAMATION_MARKS = b'!!'
-        LABEL = b' Extended!!'
-    else:
-        EXCLAMATION_MARKS = bytes((0x81, 0x49, 0x81, 0x49))
-        LABEL = b'\x20\x83G\x83N\x83X\x83e\x83\x93\x83h' + bytes((0x81, 0x49, 0x81, 0x49))
-
-    for title_offset in title_offsets:
-        title_end_idx = data.find(EXCLAMATION_MARKS, title_offset) + len(EXCLAMATION_MARKS)
-        for i, c in enumerate(LABEL):
-            data[title_end_idx + i] = c
+        if region != 'J':
+            EXCLAMATION_MARKS = b'!!'
+            LABEL = b' Extended!!'
+        else:
+            EXCLAMATION_MARKS = bytes((0x81, 0x49, 0x81, 0x49))
+            LABEL = b'\x20\x83G\x83N\x83X\x83e\x83\x93\x83h' + bytes((0x81, 0x49, 0x81, 0x49))
 
-    with open(bnr_filepath, 'wb') as f:
-        f.write(data)
+        # The titles (and the searched region) are past the image data, which is therefore not
+        # relevant here.
+        for title_offset in range(TITLE_OFFSET, len(data), NEXT_TITLE_OFFSET_STEP):
+            title_end_idx = data.find(EXCLAMATION_MARKS, title_offset) + len(EXCLAMATION_MARKS)
+            f.seek(title_end_idx)
+            f.write(LABEL)
 
     log.info('Game title tweaked.')
 
 
-def patch_title_lines(use_alternative_buttons: bool, battle_stages_enabled: bool, iso_tmp_dir: str):
+def patch_title_lines(use_alternative_buttons: bool, battle_stages_enabled: bool,
+                      raise_if_canceled: callable, iso_tmp_dir: str):
     files_dirpath = os.path.join(iso_tmp_dir, 'files')
     scenedata_dirpath = os.path.join(files_dirpath, 'SceneData')
 
     log.info('Patching title lines...')
 
+    title_images = []
+
     for language in LANGUAGES:
         language_dirpath = os.path.join(scenedata_dirpath, language)
         if not os.path.isdir(language_dirpath):
@@ -1454,8 +1700,7 @@ def patch_title_lines(use_alternative_buttons: bool, battle_stages_enabled: bool
 
         for title_filename in title_filenames:
             title_filepath = os.path.join(timg_dir, title_filename)
-            log.info(f'Modifying {title_filepath}...')
-            add_controls_to_title_image(title_filepath, language, use_alternative_buttons)
+            title_images.append((title_filepath, language))
 
         # Gradient colors are specified in the BLO file, which we want to avoid in the controls
         # icons. Also, avoid the game blurrying the images.
@@ -1488,6 +1733,14 @@ def patch_title_lines(use_alternative_buttons: bool, battle_stages_enabled: bool
                 log.warning('Unexpected colors in BLO file. Titles\' color gradient will not be '
                             'desaturated.')
 
+    # Each title image is converted back and forth with external processes; they are processed
+    # concurrently.
+    def add_controls(title_filepath: str, language: str):
+        log.info(f'Modifying {title_filepath}...')
+        add_controls_to_title_image(title_filepath, language, use_alternative_buttons)
+
+    run_concurrently(add_controls, title_images, raise_if_canceled)
+
     log.info('Title lines patched.')
 
 
@@ -1506,12 +1759,63 @@ def with_page_index_infix(page_index: int, path: str) -> str:
     return os.path.join(dirname, filename)
 
 
-def patch_cup_names(args: argparse.Namespace, page_count: int, iso_tmp_dir: str):
+def patch_cup_names(args: argparse.Namespace, page_count: int, raise_if_canceled: callable,
+                    iso_tmp_dir: str):
     files_dirpath = os.path.join(iso_tmp_dir, 'files')
     scenedata_dirpath = os.path.join(files_dirpath, 'SceneData')
 
     log.info('Patching cup names...')
 
+    # Each cup name image (and its copies for every page) is converted back and forth with external
+    # processes; the images are processed concurrently.
+    def patch_cup_name(language: str, timg_dir: str, cupname_filename: str):
+        cupname_filepath = os.path.join(timg_dir, cupname_filename)
+        log.info(f'Modifying {cupname_filepath}...')
+
+        new_cupname_filepath = with_page_index_suffix(0, cupname_filepath)
+        if args.extender_cup and 'reverse2' not in cupname_filename:
+            # Preserve original images, which are used by the Extender Cup in its cup name list.
+            # A hard link suffices, as the images are unlinked before they are modified.
+            make_link(cupname_filepath, new_cupname_filepath)
+        else:
+            rename(cupname_filepath, new_cupname_filepath)
+        cupname_filepath = new_cupname_filepath
+
+        extender_cup = args.extender_cup and 'reverse2' in cupname_filename
+
+        for page_index in range(page_count - 1):
+            page_index += 1
+
+            page_cupname_filepath = with_page_index_suffix(page_index, cupname_filepath)
+            make_link(cupname_filepath, page_cupname_filepath)
+
+            if not args.skip_cup_names or extender_cup:
+                if extender_cup:
+                    remove_file(page_cupname_filepath)
+                    generate_bti_image_from_bitmap_font(EXTENDER_CUP_LABEL[language],
+                                                        LABEL_IMAGE_SIZE[0],
+                                                        LABEL_IMAGE_SIZE[1],
+                                                        'IA4', (0, 0, 0, 0),
+                                                        page_cupname_filepath,
+                                                        default_scale=1.0)
+                add_page_number_to_cup_name_image(page_cupname_filepath, page_index + 1, page_count)
+            make_link(page_cupname_filepath,
+                      page_cupname_filepath.replace('courseselect', 'lanplay'))
+
+        if not args.skip_cup_names or extender_cup:
+            if extender_cup:
+                remove_file(cupname_filepath)
+                generate_bti_image_from_bitmap_font(EXTENDER_CUP_LABEL[language],
+                                                    LABEL_IMAGE_SIZE[0],
+                                                    LABEL_IMAGE_SIZE[1],
+                                                    'IA4', (0, 0, 0, 0),
+                                                    cupname_filepath,
+                                                    default_scale=1.0)
+            add_page_number_to_cup_name_image(cupname_filepath, 1, page_count)
+        make_link(cupname_filepath, cupname_filepath.replace('courseselect', 'lanplay'))
+
+    cupname_tasks = []
+
     for language in LANGUAGES:
         language_dirpath = os.path.join(scenedata_dirpath, language)
         if not os.path.isdir(language_dirpath):
@@ -1525,50 +1829,7 @@ def patch_cup_names(args: argparse.Namespace, page_count: int, iso_tmp_dir: str)
                              'cupname_star_cup.bti')
 
         for cupname_filename in cupname_filenames:
-            cupname_filepath = os.path.join(timg_dir, cupname_filename)
-            log.info(f'Modifying {cupname_filepath}...')
-
-            new_cupname_filepath = with_page_index_suffix(0, cupname_filepath)
-            if args.extender_cup and 'reverse2' not in cupname_filename:
-                # Preserve original images, which are used by the Extender Cup in its cup name list.
-                shutil.copyfile(cupname_filepath, new_cupname_filepath)
-            else:
-                rename(cupname_filepath, new_cupname_filepath)
-            cupname_filepath = new_cupname_filepath
-
-            extender_cup = args.extender_cup and 'reverse2' in cupname_filename
-
-            for page_index in range(page_count - 1):
-                page_index += 1
-
-                page_cupname_filepath = with_page_index_suffix(page_index, cupname_filepath)
-                make_link(cupname_filepath, page_cupname_filepath)
-
-                if not args.skip_cup_names or extender_cup:
-                    if extender_cup:
-                        remove_file(page_cupname_filepath)
-                        generate_bti_image_from_bitmap_font(EXTENDER_CUP_LABEL[language],
-                                                            LABEL_IMAGE_SIZE[0],
-                                                            LABEL_IMAGE_SIZE[1],
-                                                            'IA4', (0, 0, 0, 0),
-                                                            page_cupname_filepath,
-                                                            default_scale=1.0)
-                    add_page_number_to_cup_name_image(page_cupname_filepath, page_index + 1,
-                                                      page_count)
-                make_link(page_cupname_filepath,
-                          page_cupname_filepath.replace('courseselect', 'lanplay'))
-
-            if not args.skip_cup_names or extender_cup:
-                if extender_cup:
-                    remove_file(cupname_filepath)
-                    generate_bti_image_from_bitmap_font(EXTENDER_CUP_LABEL[language],
-                                                        LABEL_IMAGE_SIZE[0],
-                                                        LABEL_IMAGE_SIZE[1],
-                                                        'IA4', (0, 0, 0, 0),
-                                                        cupname_filepath,
-                                                        default_scale=1.0)
-                add_page_number_to_cup_name_image(cupname_filepath, 1, page_count)
-            make_link(cupname_filepath, cupname_filepath.replace('courseselect', 'lanplay'))
+            cupname_tasks.append((language, timg_dir, cupname_filename))
 
         if args.extender_cup:
             convert_png_to_bti(os.path.join(data_dir, 'extender_cup', 'cup_logo.png'),
@@ -1588,7 +1849,7 @@ def patch_cup_names(args: argparse.Namespace, page_count: int, iso_tmp_dir: str)
         convert_png_to_bti(os.path.join(data_dir, 'extender_cup', 'cup_small_logo.png'),
                            os.path.join(race2d_timg_dir, 'cup_pict_reverse2.bti'), 'RGB5A3')
 
-        shutil.copy(
+        shutil.copyfile(
             os.path.join(data_dir, 'extender_cup', 'cup.bmd'),
             os.path.join(files_dirpath, 'AwardData', 'award_alltour', 'awardallcuptour.bmd'))
 
@@ -1615,6 +1876,8 @@ def patch_cup_names(args: argparse.Namespace, page_count: int, iso_tmp_dir: str)
                 postprocessing_callback=lambda image, limited_width=limited_width: pad_image_sides(
                     image, 0, LABEL_IMAGE_SIZE[0] - limited_width))
 
+    run_concurrently(patch_cup_name, cupname_tasks, raise_if_canceled)
+
     log.info('Cup names patched.')
 
 
@@ -1670,42 +1933,29 @@ def meld_courses(
     with tempfile.TemporaryDirectory(prefix=TEMP_DIR_PREFIX) as tracks_tmp_dir:
         # Unpack ZIP archives (or copy directory is pre-unpacked) to their respective directories.
         prefix_to_nodename = {}
-        processed = 0
+        prefix_to_path = {}
         log.info('Preparing custom courses...')
         if tracks_is_dir:
-            battle_stages_enabled = False
-            for prefix in PREFIXES_WITH_BATTLE_STAGES:
-                track_index = int(prefix[1:3]) - 1
-                if track_index < RACE_TRACK_COUNT:
-                    continue
-                for path in paths:
-                    filename = os.path.basename(path)
-                    if filename.startswith(prefix):
-                        battle_stages_enabled = True
-                        break
-                if battle_stages_enabled:
-                    break
+            # Map each prefix to the first path (in the given order) whose filename starts with it.
+            filename_prefix_to_path = {}
+            for path in paths:
+                filename_prefix_to_path.setdefault(os.path.basename(path)[:3], path)
+            battle_stages_enabled = any(prefix in filename_prefix_to_path
+                                        for prefix in PREFIXES_WITH_BATTLE_STAGES
+                                        if int(prefix[1:3]) - 1 >= RACE_TRACK_COUNT)
             page_course_count = (RACE_AND_BATTLE_COURSE_COUNT
                                  if battle_stages_enabled else RACE_TRACK_COUNT)
             prefixes = PREFIXES_WITH_BATTLE_STAGES if battle_stages_enabled else PREFIXES
             for prefix in prefixes:
-                for path in paths:
-                    filename = os.path.basename(path)
-                    if filename.startswith(prefix):
-                        track_dirpath = os.path.join(tracks_tmp_dir, prefix)
-                        log.info(f'Extracting and flattening "{path}" into "{track_dirpath}"...')
-                        extract_and_flatten(path, track_dirpath)
-                        unwrap_custom_track(track_dirpath)
-                        prefix_to_nodename[prefix] = filename
-                        processed += 1
-                        raise_if_canceled()
-                        break
-                else:
+                path = filename_prefix_to_path.get(prefix)
+                if path is None:
                     # Check whether full pages have been sourced on the first missing prefix.
                     if prefix_to_nodename and len(prefix_to_nodename) % page_course_count == 0:
                         break
 
                     raise MKDDExtenderError(f'No track assigned to slot {prefix}.')
+                prefix_to_path[prefix] = path
+                prefix_to_nodename[prefix] = os.path.basename(path)
         else:
             # Since there is not common multiple, the course count can be used to determine whether
             # custom battle stages are present.
@@ -1716,14 +1966,19 @@ def meld_courses(
             prefixes = PREFIXES_WITH_BATTLE_STAGES if battle_stages_enabled else PREFIXES
             for i, path in enumerate(paths):
                 prefix = prefixes[i]
-                filename = os.path.basename(path)
-                track_dirpath = os.path.join(tracks_tmp_dir, prefix)
-                log.info(f'Extracting and flattening "{path}" into "{track_dirpath}"...')
-                extract_and_flatten(path, track_dirpath)
-                unwrap_custom_track(track_dirpath)
-                prefix_to_nodename[prefix] = filename
-                processed += 1
-                raise_if_canceled()
+                prefix_to_path[prefix] = path
+                prefix_to_nodename[prefix] = os.path.basename(path)
+
+        def prepare_custom_course(prefix: str, path: str):
+            track_dirpath = os.path.join(tracks_tmp_dir, prefix)
+            log.info(f'Extracting and flattening "{path}" into "{track_dirpath}"...')
+            extract_and_flatten(path, track_dirpath)
+            unwrap_custom_track(track_dirpath)
+
+        # Extraction is dominated by decompression (which releases the GIL) and file I/O; the custom
+        # courses are therefore prepared concurrently.
+        processed = run_concurrently(prepare_custom_course, tuple(prefix_to_path.items()),
+                                     raise_if_canceled)
         if processed > 0:
             log.info(f'{processed} custom courses have been processed.')
         else:
@@ -1777,14 +2032,15 @@ def meld_courses(
         downscale_preview_images = preview_image_factor != 1
         downscale_label_images = label_image_factor != 1
 
-        # Populate dictionary with checksums from all the stock AST files.
-        audio_tracks_checksums = {}
-        for filename in os.listdir(stream_dirpath):
-            ast_filepath = os.path.join(stream_dirpath, filename)
-            checksum = md5sum(ast_filepath)
-            audio_tracks_checksums[checksum] = filename
+        # Populate dictionary with checksums from all the stock AST files. The files are hashed
+        # concurrently (the digest is computed without holding the GIL).
+        ast_filenames = os.listdir(stream_dirpath)
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            checksums = executor.map(md5sum,
+                                     (os.path.join(stream_dirpath, f) for f in ast_filenames))
+            audio_tracks_checksums = dict(zip(checksums, ast_filenames))
 
-            raise_if_canceled()
+        raise_if_canceled()
 
         # Rename original directories.
         new_course_dirpath = with_page_index_suffix(0, course_dirpath)
@@ -1810,29 +2066,18 @@ def meld_courses(
             track_index = int(prefix[1:3]) - 1
             assert 0 <= track_index < RACE_AND_BATTLE_COURSE_COUNT
             is_battle_stage = RACE_TRACK_COUNT <= track_index
+            course = COURSES[track_index]
+            lowercase_course = course.lower()
 
             log.info(f'Melding "{nodename}" ("{track_dirpath}")...')
             melded += 1
 
+            # The page directories are already copies of the original directories. Relevant files
+            # will be replaced next.
             page_course_dirpath = with_page_index_suffix(page_index, course_dirpath)
             page_coursename_dirpath = with_page_index_suffix(page_index, coursename_dirpath)
             page_staffghosts_dirpath = with_page_index_suffix(page_index, staffghosts_dirpath)
 
-            # Start off with a copy of the original directories. Relevant files will be replaced
-            # next.
-            if not os.path.isdir(page_course_dirpath):
-                shutil.copytree(course_dirpath, page_course_dirpath, copy_function=make_link)
-            if not os.path.isdir(page_coursename_dirpath):
-                shutil.copytree(coursename_dirpath,
-                                page_coursename_dirpath,
-                                copy_function=make_link)
-            if not os.path.isdir(page_staffghosts_dirpath):
-                shutil.copytree(staffghosts_dirpath,
-                                page_staffghosts_dirpath,
-                                copy_function=make_link)
-
-            raise_if_canceled()
-
             # Parse INI file.
             try:
                 trackinfo_filepath = os.path.join(track_dirpath, 'trackinfo.ini')
@@ -1863,7 +2108,7 @@ def meld_courses(
                     f'"{nodename}" (a custom '
                     f'{"battle stage" if replaces_is_battle_stage else "race track"} that replaces '
                     f'{replaces}) '
-                    f'has been assigned to {COURSE_TO_NAME[COURSES[track_index]]} (a '
+                    f'has been assigned to {COURSE_TO_NAME[course]} (a '
                     f'{"battle stage" if is_battle_stage else "race track"} slot).')
 
             # Verify that the required code patches for the track have been enabled.
@@ -1901,35 +2146,39 @@ def meld_courses(
                 elif replaces:
                     alternative_audio_data[prefix] = course_name_to_course(replaces)
 
+            # Scan the track directory once; the optional files are looked up in the set. Names are
+            # lowercased where the file system is case-insensitive, as `os.path.isfile()` would be.
+            with os.scandir(track_dirpath) as it:
+                track_filenames = {
+                    entry.name if linux else entry.name.lower()
+                    for entry in it if entry.is_file()
+                }
+
             # Copy course files.
             track_filepath = os.path.join(track_dirpath, 'track.arc')
-            if not os.path.isfile(track_filepath):
+            if 'track.arc' not in track_filenames:
                 raise MKDDExtenderError(f'Unable to locate `track.arc` file in "{nodename}".')
             track_mp_filepath = os.path.join(track_dirpath, 'track_mp.arc')
-            if not os.path.isfile(track_mp_filepath):
+            if 'track_mp.arc' not in track_filenames:
                 track_mp_filepath = track_filepath
             else:
                 log.info(f'Located `track_mp.arc` file in "{nodename}".')
             if track_index == 0:
                 track_50cc_filepath = os.path.join(track_dirpath, 'track_50cc.arc')
-                if not os.path.isfile(track_50cc_filepath):
+                if 'track_50cc.arc' not in track_filenames:
                     track_50cc_filepath = track_filepath
                 else:
                     log.info(f'Located `track_50cc.arc` file in "{nodename}".')
                 track_mp_50cc_filepath = os.path.join(track_dirpath, 'track_mp_50cc.arc')
-                if not os.path.isfile(track_mp_50cc_filepath):
+                if 'track_mp_50cc.arc' not in track_filenames:
                     track_mp_50cc_filepath = track_mp_filepath
                 else:
                     log.info(f'Located `track_mp_50cc.arc` file in "{nodename}".')
-            if track_index == 0:
-                page_track_filepath = os.path.join(page_course_dirpath,
-                                                   f'{COURSES[track_index]}2.arc')
-                page_track_mp_filepath = os.path.join(page_course_dirpath,
-                                                      f'{COURSES[track_index]}2L.arc')
-                page_track_50cc_filepath = os.path.join(page_course_dirpath,
-                                                        f'{COURSES[track_index]}.arc')
-                page_track_mp_50cc_filepath = os.path.join(page_course_dirpath,
-                                                           f'{COURSES[track_index]}L.arc')
+
+                page_track_filepath = os.path.join(page_course_dirpath, f'{course}2.arc')
+                page_track_mp_filepath = os.path.join(page_course_dirpath, f'{course}2L.arc')
+                page_track_50cc_filepath = os.path.join(page_course_dirpath, f'{course}.arc')
+                page_track_mp_50cc_filepath = os.path.join(page_course_dirpath, f'{course}L.arc')
                 make_link(track_filepath, page_track_filepath)
                 make_link(track_mp_filepath, page_track_mp_filepath)
                 make_link(track_50cc_filepath, page_track_50cc_filepath)
@@ -1942,16 +2191,13 @@ def meld_courses(
 
                 raise_if_canceled()
 
-                repack_course_arc_file(page_track_filepath, f'{COURSES[track_index].lower()}2')
-                repack_course_arc_file(page_track_mp_filepath, f'{COURSES[track_index].lower()}2l')
-                repack_course_arc_file(page_track_50cc_filepath, f'{COURSES[track_index].lower()}')
-                repack_course_arc_file(page_track_mp_50cc_filepath,
-                                       f'{COURSES[track_index].lower()}l')
+                repack_course_arc_file(page_track_filepath, f'{lowercase_course}2')
+                repack_course_arc_file(page_track_mp_filepath, f'{lowercase_course}2l')
+                repack_course_arc_file(page_track_50cc_filepath, lowercase_course)
+                repack_course_arc_file(page_track_mp_50cc_filepath, f'{lowercase_course}l')
             else:
-                page_track_filepath = os.path.join(page_course_dirpath,
-                                                   f'{COURSES[track_index]}.arc')
-                page_track_mp_filepath = os.path.join(page_course_dirpath,
-                                                      f'{COURSES[track_index]}L.arc')
+                page_track_filepath = os.path.join(page_course_dirpath, f'{course}.arc')
+                page_track_mp_filepath = os.path.join(page_course_dirpath, f'{course}L.arc')
                 make_link(track_filepath, page_track_filepath)
                 make_link(track_mp_filepath, page_track_mp_filepath)
 
@@ -1960,8 +2206,8 @@ def meld_courses(
 
                 raise_if_canceled()
 
-                repack_course_arc_file(page_track_filepath, f'{COURSES[track_index].lower()}')
-                repack_course_arc_file(page_track_mp_filepath, f'{COURSES[track_index].lower()}l')
+                repack_course_arc_file(page_track_filepath, lowercase_course)
+                repack_course_arc_file(page_track_mp_filepath, f'{lowercase_course}l')
 
             tilt_setting_data[(page_index, track_index)] = \
                 get_tilt_setting_from_bol_file(page_track_filepath)
@@ -1971,9 +2217,8 @@ def meld_courses(
             # Copy GHT file.
             if not is_battle_stage:
                 ght_filepath = os.path.join(track_dirpath, 'staffghost.ght')
-                if os.path.isfile(ght_filepath):
-                    page_ght_filepath = os.path.join(page_staffghosts_dirpath,
-                                                     f'{COURSES[track_index]}.ght')
+                if 'staffghost.ght' in track_filenames:
+                    page_ght_filepath = os.path.join(page_staffghosts_dirpath, f'{course}.ght')
                     make_link(ght_filepath, page_ght_filepath)
                 else:
                     log.warning(f'Unable to locate `staffghost.ght` file in "{nodename}".')
@@ -2013,18 +2258,18 @@ def meld_courses(
                     # the stock directory. The names of the audio files strategically start with a
                     # "X_" prefix to ensure they are inserted after the stock audio files.
                     lap_music_normal_filepath = os.path.join(track_dirpath, 'lap_music_normal.ast')
-                    if not os.path.isfile(lap_music_normal_filepath):
+                    if 'lap_music_normal.ast' not in track_filenames:
                         # If there is only the fast version (single-lap course?), it will be used
                         # for both, and no warning is needed.
                         lap_music_normal_filepath = os.path.join(track_dirpath,
                                                                  'lap_music_fast.ast')
-                    if os.path.isfile(lap_music_normal_filepath):
+                    if os.path.basename(lap_music_normal_filepath) in track_filenames:
                         dst_ast_filepath = os.path.join(stream_dirpath, f'X_COURSE_{prefix}.ast')
                         conform_and_copy_if_not_cached(lap_music_normal_filepath, dst_ast_filepath,
                                                        args)
 
                         lap_music_fast_filepath = os.path.join(track_dirpath, 'lap_music_fast.ast')
-                        if os.path.isfile(lap_music_fast_filepath):
+                        if 'lap_music_fast.ast' in track_filenames:
                             dst_ast_filepath = os.path.join(stream_dirpath,
                                                             f'X_FINALLAP_{prefix}.ast')
                             conform_and_copy_if_not_cached(lap_music_fast_filepath,
@@ -2121,6 +2366,7 @@ def meld_courses(
             if not expected_languages:
                 raise MKDDExtenderError(f'Unable to locate language directories in "{nodename}" '
                                         'for course logo.')
+            coursename_filename = f'{course}_name.bti'
             for language in expected_languages:
                 logo_filepath = find_and_conform_or_generate_image_path(
                     language, 'track_big_logo.bti', 208, 104, 'RGB5A3', (0, 0, 0, 0))
@@ -2131,7 +2377,7 @@ def meld_courses(
                 os.makedirs(page_coursename_language_dirpath, exist_ok=True)
 
                 page_coursename_filepath = os.path.join(page_coursename_language_dirpath,
-                                                        f'{COURSES[track_index]}_name.bti')
+                                                        coursename_filename)
                 copy_or_link_bti_image(logo_filepath, page_coursename_filepath)
 
             expected_languages = os.listdir(scenedata_dirpath)
@@ -2140,8 +2386,8 @@ def meld_courses(
                 raise MKDDExtenderError('Unable to locate `SceneData/language` directories in '
                                         f'"{nodename}".')
 
-            preview_image_partial_name = COURSE_TO_PREVIEW_IMAGE_NAME[COURSES[track_index]]
-            label_image_partial_name = COURSE_TO_LABEL_IMAGE_NAME[COURSES[track_index]]
+            preview_image_partial_name = COURSE_TO_PREVIEW_IMAGE_NAME[course]
+            label_image_partial_name = COURSE_TO_LABEL_IMAGE_NAME[course]
             if not is_battle_stage:
                 preview_filename = f'cop_{preview_image_partial_name}.bti'
                 label_filename = f'coname_{label_image_partial_name}.bti'
@@ -2255,6 +2501,16 @@ def meld_courses(
 
         raise_if_canceled()
 
+        # Start off with a copy (made of hard links) of the original directories for every page
+        # that will be populated.
+        page_indices = sorted(
+            {ord(prefix[0]) - ord('A') + 1
+             for prefix in prefixes[:len(prefix_to_nodename)]})
+        copy_tree_tasks = tuple(
+            (dirpath, with_page_index_suffix(page_index, dirpath)) for page_index in page_indices
+            for dirpath in (course_dirpath, coursename_dirpath, staffghosts_dirpath))
+        run_concurrently(link_tree, copy_tree_tasks, raise_if_canceled)
+
         # Copy files into the ISO temporary directory.
         log.info('Melding directories...')
 
@@ -2272,7 +2528,9 @@ def meld_courses(
 
         raise_if_canceled()
 
-        # Downscale images to ensure space limits are met.
+        # Downscale images to ensure space limits are met. The images are gathered first, and then
+        # converted concurrently (each conversion involves running external processes).
+        conform_tasks = []
         if downscale_preview_images:
             log.info(
                 f'Downscaling preview images to {preview_image_size[0]}x{preview_image_size[1]}...')
@@ -2284,7 +2542,7 @@ def meld_courses(
                     for filename in os.listdir(courseselect_dirpath):
                         if filename.startswith('cop_') and filename.endswith('.bti'):
                             filepath = os.path.join(courseselect_dirpath, filename)
-                            conform_bti_image(filepath, *preview_image_size, 'CMPR')
+                            conform_tasks.append((filepath, *preview_image_size, 'CMPR'))
 
                 raise_if_canceled()
 
@@ -2301,8 +2559,8 @@ def meld_courses(
                         for filename in os.listdir(mapselect_dirpath):
                             if 'ttlemapsnap' in filename and filename.endswith('.bti'):
                                 filepath = os.path.join(mapselect_dirpath, filename)
-                                conform_bti_image(filepath, *battle_stages_preview_image_size,
-                                                  'CMPR')
+                                conform_tasks.append(
+                                    (filepath, *battle_stages_preview_image_size, 'CMPR'))
 
                     raise_if_canceled()
 
@@ -2316,7 +2574,7 @@ def meld_courses(
                     for filename in os.listdir(courseselect_dirpath):
                         if filename.startswith('coname_') and filename.endswith('.bti'):
                             filepath = os.path.join(courseselect_dirpath, filename)
-                            conform_bti_image(filepath, *label_image_size, 'IA4')
+                            conform_tasks.append((filepath, *label_image_size, 'IA4'))
 
                 raise_if_canceled()
 
@@ -2332,10 +2590,13 @@ def meld_courses(
                         for filename in os.listdir(mapselect_dirpath):
                             if 'zi_map' in filename and filename.endswith('.bti'):
                                 filepath = os.path.join(mapselect_dirpath, filename)
-                                conform_bti_image(filepath, *battle_stages_label_image_size, 'IA4')
+                                conform_tasks.append(
+                                    (filepath, *battle_stages_label_image_size, 'IA4'))
 
                 raise_if_canceled()
 
+        run_concurrently(conform_bti_image, conform_tasks, raise_if_canceled)
+
         raise_if_canceled()
 
         # Embed page number and page count in the preview image of the first battle stage in every
@@ -3290,6 +3551,8 @@ def create_args_parser() -> argparse.ArgumentParser:
 def extend_game(args: argparse.Namespace, raise_if_canceled: callable = lambda: None):
     start_time = time.monotonic()
 
+    BTI_IMAGE_MAP.clear()  # In case a previous build was interrupted.
+
     if not args.input:
         raise MKDDExtenderError('Path to the input ISO file cannot be empty.')
     if not args.output:
@@ -3321,7 +3584,7 @@ def extend_game(args: argparse.Namespace, raise_if_canceled: callable = lambda:
         args.skip_menu_titles = True
         args.skip_minimap_transforms_removal = True
 
-    with tempfile.TemporaryDirectory(prefix=TEMP_DIR_PREFIX) as iso_tmp_dir:
+    with temporary_directory_with_deferred_removal() as iso_tmp_dir:
         # Extract the ISO file entirely for now. In the future, only extracting the files that need
         # to be read might be ideal performance-wise.
         log.info(f'Extracting "{args.input}" image to "{iso_tmp_dir}"...')
@@ -3332,75 +3595,80 @@ def extend_game(args: argparse.Namespace, raise_if_canceled: callable = lambda:
             raise MKDDExtenderError(f'Unable to read input ISO image: {str(e)}') from e
         if os.path.join('files', 'Cours0') in gcm_file.dirs_by_path:
             raise MKDDExtenderError('The input ISO image appears to have been extended already.')
-        files_extracted = 0
-        for _filepath, files_done in gcm_file.export_disc_to_folder_with_changed_files(iso_tmp_dir):
-            if files_done > 0:
-                files_extracted = files_done
+        # The generator is drained in C; only the last two items are retained, as the very last
+        # one is the `("Done", -1)` sentinel.
+        last_progress = collections.deque(
+            gcm_file.export_disc_to_folder_with_changed_files(iso_tmp_dir), maxlen=2)
+        files_extracted = max((files_done for _filepath, files_done in last_progress), default=0)
         log.info(f'Image extracted ({files_extracted} files).')
 
-        raise_if_canceled()
-
-        # Verify whether the DOL file is authentic or has been externally modified already.
-        verify_dol_checksum(args, iso_tmp_dir)
-
-        raise_if_canceled()
-
-        # To determine which have been added, build the initial list now.
-        log.info('Building initial file list...')
-        initial_file_list = build_file_list(iso_tmp_dir)
-        log.info(f'File list built ({len(initial_file_list)} entries).')
+        # To determine which have been added, build the initial list now. It is derived from the
+        # file system table of the image, which is exactly what has just been extracted.
+        initial_file_list = build_file_list_from_gcm(gcm_file)
+        log.info(f'Initial file list built ({len(initial_file_list)} entries).')
 
         raise_if_canceled()
 
-        # Extract the relevant RARC files that will be modified.
-        log.info('Extracting RARC files...')
-        RARC_FILENAMES = ('courseselect.arc', 'LANPlay.arc', 'mapselect.arc', 'titleline.arc')
+        # Extract the relevant RARC files that will be modified. The archives are gathered first,
+        # and then extracted concurrently into their parent directories. `race2d.arc` is only
+        # reachable once `MRAM.arc` has been extracted, and is therefore extracted afterwards.
+        # The archives in the language directories are only modified when custom courses are
+        # added, and `titleline.arc` only when the menu titles are patched; untouched archives are
+        # neither extracted nor re-packed.
+        RARC_FILENAMES = tuple(
+            filename
+            for filename in ('courseselect.arc', 'LANPlay.arc', 'mapselect.arc', 'titleline.arc')
+            if paths and (filename != 'titleline.arc' or not args.skip_menu_titles))
         files_dirpath = os.path.join(iso_tmp_dir, 'files')
         scenedata_dirpath = os.path.join(files_dirpath, 'SceneData')
         scenedata_filenames = os.listdir(scenedata_dirpath)
-        rarc_extracted = 0
+        rarc_filepaths = []
         for language in LANGUAGES:
             if language not in scenedata_filenames:
                 continue
             for filename in RARC_FILENAMES:
-                filepath = os.path.join(scenedata_dirpath, language, filename)
-                rarc.extract(filepath, os.path.dirname(filepath))
-                rarc_extracted += 1
-                raise_if_canceled()
+                rarc_filepaths.append(os.path.join(scenedata_dirpath, language, filename))
         if args.extender_cup:
             cup2d_filepath = os.path.join(scenedata_dirpath, 'cup2d.arc')
-            rarc.extract(cup2d_filepath, scenedata_dirpath)
-            rarc_extracted += 1
-            raise_if_canceled()
             mram_filepath = os.path.join(files_dirpath, 'MRAM.arc')
-            rarc.extract(mram_filepath, files_dirpath)
-            rarc_extracted += 1
-            raise_if_canceled()
             mram_dirpath = os.path.join(files_dirpath, 'mram')
             race2d_filepath = os.path.join(mram_dirpath, 'race2d.arc')
-            rarc.extract(race2d_filepath, mram_dirpath)
-            rarc_extracted += 1
-            raise_if_canceled()
             awarddata_dirpath = os.path.join(files_dirpath, 'AwardData')
             award_alltour_filepath = os.path.join(awarddata_dirpath, 'Award_AllTour.arc')
-            rarc.extract(award_alltour_filepath, awarddata_dirpath)
-            rarc_extracted += 1
-            raise_if_canceled()
+            rarc_filepaths.extend((cup2d_filepath, mram_filepath, award_alltour_filepath))
             mram_locale_dirpath = os.path.join(files_dirpath, 'MRAM_Locale')
             mram_locale_filenames = os.listdir(mram_locale_dirpath)
             for language in LANGUAGES:
                 if language not in mram_locale_filenames:
                     continue
-                filepath = os.path.join(mram_locale_dirpath, language, 'MRAMLoc.arc')
-                rarc.extract(filepath, os.path.dirname(filepath))
+                rarc_filepaths.append(os.path.join(mram_locale_dirpath, language, 'MRAMLoc.arc'))
+
+        def extract_rarc_files() -> int:
+            extract_tasks = tuple(
+                (filepath, os.path.dirname(filepath)) for filepath in rarc_filepaths)
+            rarc_extracted = run_concurrently(rarc.extract, extract_tasks, raise_if_canceled)
+            if args.extender_cup:
+                rarc.extract(race2d_filepath, mram_dirpath)
                 rarc_extracted += 1
                 raise_if_canceled()
-        log.info(f'{rarc_extracted} files extracted.')
+            return rarc_extracted
 
-        raise_if_canceled()
+        # The RARC files are extracted in the background while the DOL file is verified and the BNR
+        # file is patched, as they involve unrelated files.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            log.info('Extracting RARC files...')
+            rarc_future = executor.submit(extract_rarc_files)
+
+            # Verify whether the DOL file is authentic or has been externally modified already.
+            verify_dol_checksum(args, iso_tmp_dir)
 
-        if not args.skip_banner:
-            patch_bnr_file(iso_tmp_dir)
+            raise_if_canceled()
+
+            if not args.skip_banner:
+                patch_bnr_file(iso_tmp_dir)
+
+            rarc_extracted = rarc_future.result()
+        log.info(f'{rarc_extracted} files extracted.')
 
         raise_if_canceled()
 
@@ -3420,16 +3688,18 @@ def extend_game(args: argparse.Namespace, raise_if_canceled: callable = lambda:
         if paths:
             if not args.skip_menu_titles:
                 patch_title_lines(bool(args.use_alternative_buttons), battle_stages_enabled,
-                                  iso_tmp_dir)
+                                  raise_if_canceled, iso_tmp_dir)
 
             raise_if_canceled()
 
             page_count = len(added_course_names) // (
                 RACE_AND_BATTLE_COURSE_COUNT if battle_stages_enabled else RACE_TRACK_COUNT) + 1
-            patch_cup_names(args, page_count, iso_tmp_dir)
+            patch_cup_names(args, page_count, raise_if_canceled, iso_tmp_dir)
 
             raise_if_canceled()
 
+        BTI_IMAGE_MAP.clear()  # No more images are decoded from here on.
+
         patch_dol_file(
             args,
             replaces_data,
@@ -3444,38 +3714,39 @@ def extend_game(args: argparse.Namespace, raise_if_canceled: callable = lambda:
 
         raise_if_canceled()
 
-        # Re-pack RARC files, and erase directories.
+        # Re-pack RARC files, and erase directories. The archives are independent of one another
+        # (except for `race2d.arc`, which is contained in `MRAM.arc`, and is therefore packed
+        # first), and are packed concurrently.
         log.info('Packing RARC files...')
         rarc_packed = 0
+
+        # Once packed, the directories are moved out of the image tree (a cheap rename), and
+        # removed in the background when all the archives have been packed.
+        discarded_dirpath = tempfile.mkdtemp(prefix=TEMP_DIR_PREFIX)
+
+        def pack_rarc_file(dirpath: str, filepath: str):
+            rarc.pack(dirpath, filepath)
+            os.rename(
+                dirpath,
+                os.path.join(tempfile.mkdtemp(dir=discarded_dirpath), os.path.basename(dirpath)))
+
+        pack_tasks = []
         if args.extender_cup:
             for language in LANGUAGES:
                 if language not in mram_locale_filenames:
                     continue
                 filepath = os.path.join(mram_locale_dirpath, language, 'MRAMLoc.arc')
                 dirpath = os.path.join(mram_locale_dirpath, language, 'mramloc')
-                rarc.pack(dirpath, filepath)
-                shutil.rmtree(dirpath)
-                rarc_packed += 1
-                raise_if_canceled()
+                pack_tasks.append((dirpath, filepath))
             award_alltour_dirpath = os.path.join(awarddata_dirpath, 'award_alltour')
-            rarc.pack(award_alltour_dirpath, award_alltour_filepath)
-            shutil.rmtree(award_alltour_dirpath)
-            rarc_packed += 1
-            raise_if_canceled()
+            pack_tasks.append((award_alltour_dirpath, award_alltour_filepath))
             race2d_dirpath = os.path.join(mram_dirpath, 'mram_race2d')
-            rarc.pack(race2d_dirpath, race2d_filepath)
-            shutil.rmtree(race2d_dirpath)
-            rarc_packed += 1
-            raise_if_canceled()
-            rarc.pack(mram_dirpath, mram_filepath)
-            shutil.rmtree(mram_dirpath)
+            pack_rarc_file(race2d_dirpath, race2d_filepath)
             rarc_packed += 1
             raise_if_canceled()
+            pack_tasks.append((mram_dirpath, mram_filepath))
             cup2d_dirpath = os.path.join(scenedata_dirpath, 'cup2d')
-            rarc.pack(cup2d_dirpath, cup2d_filepath)
-            shutil.rmtree(cup2d_dirpath)
-            rarc_packed += 1
-            raise_if_canceled()
+            pack_tasks.append((cup2d_dirpath, cup2d_filepath))
         for language in LANGUAGES:
             if language not in scenedata_filenames:
                 continue
@@ -3483,10 +3754,11 @@ def extend_game(args: argparse.Namespace, raise_if_canceled: callable = lambda:
                 filepath = os.path.join(scenedata_dirpath, language, filename)
                 dirname = os.path.splitext(filename)[0].lower()
                 dirpath = os.path.join(scenedata_dirpath, language, dirname)
-                rarc.pack(dirpath, filepath)
-                shutil.rmtree(dirpath)
-                rarc_packed += 1
-                raise_if_canceled()
+                pack_tasks.append((dirpath, filepath))
+        try:
+            rarc_packed += run_concurrently(pack_rarc_file, pack_tasks, raise_if_canceled)
+        finally:
+            threading.Thread(target=shutil.rmtree, args=(discarded_dirpath, True)).start()
         log.info(f'{rarc_packed} files packed.')
 
         raise_if_canceled()
@@ -3534,9 +3806,13 @@ def extend_game(args: argparse.Namespace, raise_if_canceled: callable = lambda:
         # file will have to be read regardless.
         log.info('Preparing ISO image...')
         final_file_list = build_file_list(iso_tmp_dir)
+        # Membership tests are performed against sets; iteration still follows the file lists,
+        # which are in pre-order (parent directories are always visited before their children).
+        initial_file_set = frozenset(initial_file_list)
+        final_file_set = frozenset(final_file_list)
         # Also drop from the list those directories and files that no longer exist in the image.
         for path in initial_file_list:
-            if path not in final_file_list:
+            if path not in final_file_set:
                 dir_entry = gcm_file.dirs_by_path_lowercase.get(path.lower())
                 if dir_entry is not None:
                     gcm_file.delete_directory(dir_entry)
@@ -3545,7 +3821,7 @@ def extend_game(args: argparse.Namespace, raise_if_canceled: callable = lambda:
                 if file_entry is not None:
                     gcm_file.delete_file(file_entry)
         for path in final_file_list:
-            if path not in initial_file_list:
+            if path not in initial_file_set:
                 if os.path.isfile(os.path.join(iso_tmp_dir, path)):
                     gcm_file.add_new_file(path)
                 else:
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the `mkdd_extender` module.
+"""
+import os
+import random
+import sys
+import tempfile
+import wave
+
+import pytest
+from PIL import Image
+
+import ast_converter
+import mkdd_extender
+
+
+def _generate_words_image(seed: int) -> Image.Image:
+    """
+    Generates an image with a random number of "words" (blocks of random pixels) separated by gaps
+    of varying widths, similar to the text in the title images.
+    """
+    rng = random.Random(seed)
+
+    width = 256
+    height = 16
+    image = Image.new('RGBA', (width, height))
+
+    x = rng.randint(0, 10)
+    while x < width - 10:
+        word_width = rng.randint(1, 30)
+        for column in range(x, min(width, x + word_width)):
+            # Pixels (and entire columns) that are transparent but not blank are also generated, as
+            # these are not treated as gaps.
+            transparent_column = rng.random() < 0.2
+            for row in range(height):
+                if rng.random() < 0.5:
+                    continue
+                transparent = transparent_column or rng.random() < 0.1
+                alpha = 0 if transparent else rng.randint(1, 255)
+                color = tuple(rng.randint(0, 255) for _ in range(3))
+                image.putpixel((column, row), color + (alpha, ))
+        x += word_width + rng.randint(1, 5)
+
+    return image
+
+
+@pytest.mark.skipif(not mkdd_extender._NUMPY_AVAILABLE, reason='NumPy not available')
+def test_split_image():
+    for seed in range(50):
+        image = _generate_words_image(seed)
+
+        expected_images = mkdd_extender.split_image_naive(image)
+        images = mkdd_extender.split_image_numpy(image)
+
+        assert len(images) == len(expected_images)
+        for expected_image, image in zip(expected_images, images):
+            assert image.size == expected_image.size
+            assert image.tobytes() == expected_image.tobytes()
+
+
+@pytest.mark.skipif(not mkdd_extender._NUMPY_AVAILABLE, reason='NumPy not available')
+def test_mix_channels_to_mono():
+    rng = random.Random(0)
+
+    for bit_depth in (8, 16, 32):
+        for channel_count in (2, 4):
+            data = rng.randbytes(1000 * channel_count * bit_depth // 8)
+
+            expected_data = mkdd_extender.mix_channels_to_mono_naive(data, bit_depth, channel_count)
+            data = mkdd_extender.mix_channels_to_mono_numpy(data, bit_depth, channel_count)
+
+            assert data == expected_data
+
+
+def test_conform_audio_file():
+    """
+    Exercises the function end to end, by converting AST files with different channel counts.
+    """
+    rng = random.Random(0)
+
+    BIT_DEPTH = 16
+    SAMPLE_RATE = 32000
+    FRAME_COUNT = 5000
+
+    for channel_count in (1, 2, 4):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            data = rng.randbytes(FRAME_COUNT * channel_count * BIT_DEPTH // 8)
+
+            wav_filepath = os.path.join(tmp_dir, 'audio.wav')
+            with wave.open(wav_filepath, 'wb') as f:
+                f.setsampwidth(BIT_DEPTH // 8)
+                f.setnchannels(channel_count)
+                f.setframerate(SAMPLE_RATE)
+                f.writeframes(data)
+
+            ast_filepath = os.path.join(tmp_dir, 'audio.ast')
+            ast_converter.convert_to_ast(wav_filepath,
+                                         ast_filepath,
+                                         looped=0xFFFF,
+                                         sample_count=FRAME_COUNT,
+                                         loop_start=1000,
+                                         loop_end=FRAME_COUNT,
+                                         volume=127,
+                                         last_block_size=None)
+
+            mkdd_extender.conform_audio_file(ast_filepath, True, 0)
+
+            ast_info = ast_converter.get_ast_info(ast_filepath)
+            assert ast_info['channel_count'] == 1
+            assert ast_info['sample_rate'] == SAMPLE_RATE
+            assert ast_info['sample_count'] == FRAME_COUNT
+            assert ast_info['loop_start'] == 1000
+            assert ast_info['loop_end'] == FRAME_COUNT
+
+            ast_converter.convert_to_wav(ast_filepath, wav_filepath)
+            with wave.open(wav_filepath, 'rb') as f:
+                conformed_data = f.readframes(f.getnframes())
+            if channel_count != 1:
+                data = mkdd_extender.mix_channels_to_mono_naive(data, BIT_DEPTH, channel_count)
+            # The last block in the AST file is padded; the padding is extracted too.
+            assert conformed_data[:len(data)] == data
+
+            mkdd_extender.conform_audio_file(ast_filepath, True, SAMPLE_RATE // 2)
+
+            ast_info = ast_converter.get_ast_info(ast_filepath)
+            assert ast_info['channel_count'] == 1
+            assert ast_info['sample_rate'] == SAMPLE_RATE // 2
+            assert ast_info['sample_count'] == FRAME_COUNT // 2
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main(sys.argv))
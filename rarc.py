@@ -130,6 +130,58 @@ def _decompress(data: memoryview) -> memoryview:
     return uncompressed_data_view
 
 
+def find_file_offset(data, predicate: callable) -> int:
+    # Returns the offset (relative to the start of the data) of the contents of the first file whose
+    # name satisfies the predicate, or -1 if there is no such file. Only the headers are parsed, so
+    # this is considerably faster than extracting the archive when a single file is wanted. The
+    # archive must be uncompressed (-1 is returned for Yaz0-compressed data).
+    if data[:len(__MAGIC)] != __MAGIC:
+        return -1
+
+    try:
+        entry_data_section_offset = struct.unpack_from('>L', data, 0x0C)[0]
+        (
+            _node_count,
+            _node_section_offset,
+            entry_count,
+            entry_section_offset,
+            string_table_size,
+            string_table_offset,
+        ) = struct.unpack_from('>LLLLLL', data, __HEADER_SIZE)
+    except struct.error:
+        return -1
+
+    # Make offsets relative to the start of the RARC file.
+    entry_data_section_offset += __HEADER_SIZE
+    entry_section_offset += __HEADER_SIZE
+    string_table_offset += __HEADER_SIZE
+
+    string_table = bytes(data[string_table_offset:string_table_offset + string_table_size])
+
+    for i in range(entry_count):
+        entry_offset = entry_section_offset + i * __ENTRY_SIZE
+        try:
+            (
+                _entry_index,
+                _string_hash,
+                entry_type,
+                string_offset,
+                entry_data_offset,
+            ) = struct.unpack_from('>HHHHL', data, entry_offset)
+        except struct.error:
+            return -1
+
+        if entry_type != __FILE_TYPE:
+            continue
+
+        string_end = string_table.find(b'\0', string_offset)
+        name = string_table[string_offset:string_end if string_end >= 0 else None]
+        if predicate(name):
+            return entry_data_section_offset + entry_data_offset
+
+    return -1
+
+
 def extract(src_filepath: str, dst_dirpath: str):
     # Read all file into nearby memory.
     with open(src_filepath, 'rb') as f:
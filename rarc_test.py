@@ -81,6 +81,50 @@ def test_synthetic_data_set():
                 assert __cmpdir(test_dir, extracted_test_dir)
 
 
+def test_find_file_offset():
+    """
+    Packs an archive in which the contents of the file being looked up (its first bytes) also
+    appear in other files, and verifies that the offset of the right file is returned.
+    """
+    MAGIC = b'0015'
+    data_set = (
+        ('a.bmd', os.urandom(100) + MAGIC + os.urandom(100)),
+        ('b/c.bol', MAGIC + os.urandom(200)),
+        ('d_course.bol', MAGIC + os.urandom(300)),
+        ('e.bti', MAGIC + os.urandom(400)),
+    )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_dir = os.path.join(tmp_dir, 'test')
+        for relpath, file_data in data_set:
+            path = os.path.join(test_dir, relpath)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(file_data)
+
+        arc_filepath = f'{test_dir}.arc'
+        rarc.pack(test_dir, arc_filepath)
+
+        with open(arc_filepath, 'rb') as f:
+            data = f.read()
+
+        # Files in the root directory come before the files in its subdirectories.
+        offset = rarc.find_file_offset(data, lambda name: name.endswith(b'.bol'))
+        assert data[offset:offset + len(data_set[2][1])] == data_set[2][1]
+
+        offset = rarc.find_file_offset(data, lambda name: name == b'c.bol')
+        assert data[offset:offset + len(data_set[1][1])] == data_set[1][1]
+
+        offset = rarc.find_file_offset(data, lambda name: name == b'a.bmd')
+        assert data[offset:offset + len(data_set[0][1])] == data_set[0][1]
+
+        # Directories are not files.
+        assert rarc.find_file_offset(data, lambda name: name == b'b') == -1
+
+        assert rarc.find_file_offset(data, lambda name: name == b'f.bol') == -1
+        assert rarc.find_file_offset(b'Yaz0' + data[4:], lambda name: True) == -1
+
+
 def test_stock_data_set():
     """
     Exercises the module by extracting, repacking, and re-extracting a set of RARC files generated
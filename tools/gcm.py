@@ -26,10 +26,12 @@ Borrowed from https://github.com/LagoLunatic/wwrando/tree/5fa6da83f10cca85ccc2dc
 """
 
 import os
+import shutil
 import struct
 from io import BytesIO
 
 MAX_DATA_SIZE_TO_READ_AT_ONCE = 64*1024*1024 # 64MB
+COPY_BUFFER_SIZE = 1024*1024 # 1MB
 
 PADDING_BYTES = b"This is padding data to alignme"
 
@@ -45,6 +47,46 @@ def data_len(data):
   data_length = data.seek(0, 2)
   return data_length
 
+
+class DiskFileData:
+  # File data that is read lazily from a file on disk. It provides the subset of the BytesIO interface
+  # that is used on file data (seek, tell, and read), so that the contents of the file are only held in
+  # memory while they are being read.
+  # The file is opened on the first read, and stays open until a read reaches the end of the file, so that
+  # a file that is exported in chunks is only opened once.
+  
+  def __init__(self, file_path):
+    self.file_path = file_path
+    self.offset = 0
+    self.file = None
+  
+  def seek(self, offset, whence=0):
+    if whence == 1:
+      offset += self.offset
+    elif whence == 2:
+      offset += os.path.getsize(self.file_path)
+    self.offset = offset
+    return self.offset
+  
+  def tell(self):
+    return self.offset
+  
+  def read(self, size=-1):
+    if self.file is None:
+      self.file = open(self.file_path, "rb")
+    self.file.seek(self.offset)
+    data = self.file.read(size)
+    self.offset += len(data)
+    if size is None or size < 0 or not data:
+      self.close()
+    return data
+  
+  def close(self):
+    if self.file is not None:
+      self.file.close()
+      self.file = None
+
+
 def make_copy_data(data):
   copy_data = read_all_bytes(data)
   return BytesIO(copy_data)
@@ -370,49 +412,51 @@ class GCM:
     for file_path, file_entry in self.files_by_path.items():
       full_file_path = os.path.join(input_directory, file_path)
       if os.path.isfile(full_file_path):
-        with open(full_file_path, "rb") as f:
-          self.changed_files[file_path] = BytesIO(f.read())
-          num_files_overwritten += 1
+        # The file data is read lazily (and streamed) when the ISO is written, so that the contents
+        # of the entire disc are never held in memory at once.
+        self.changed_files[file_path] = DiskFileData(full_file_path)
+        num_files_overwritten += 1
     
     return num_files_overwritten
   
   def export_disc_to_folder_with_changed_files(self, output_folder_path, only_changed_files=False):
     files_done = 0
     
-    for file_path, file_entry in self.files_by_path.items():
-      full_file_path = os.path.join(output_folder_path, file_path)
-      dir_name = os.path.dirname(full_file_path)
-      
-      if file_path in self.changed_files:
-        if not os.path.isdir(dir_name):
-          os.makedirs(dir_name)
-        
-        file_data = self.changed_files[file_path]
-        with open(full_file_path, "wb") as f:
-          file_data.seek(0)
-          f.write(file_data.read())
-      else:
-        if only_changed_files:
-          continue
-        if not os.path.isdir(dir_name):
-          os.makedirs(dir_name)
+    # The input ISO is opened once for the whole export, rather than once per read.
+    with open(self.iso_path, "rb") as iso_file:
+      for file_path, file_entry in self.files_by_path.items():
+        full_file_path = os.path.join(output_folder_path, file_path)
+        dir_name = os.path.dirname(full_file_path)
         
-        # Need to avoid reading enormous files all at once
-        size_remaining = file_entry.file_size
-        offset_in_file = 0
-        with open(full_file_path, "wb") as f:
-          while size_remaining > 0:
-            size_to_read = min(size_remaining, MAX_DATA_SIZE_TO_READ_AT_ONCE)
-            
-            with open(self.iso_path, "rb") as iso_file:
+        if file_path in self.changed_files:
+          if not os.path.isdir(dir_name):
+            os.makedirs(dir_name)
+          
+          file_data = self.changed_files[file_path]
+          with open(full_file_path, "wb") as f:
+            file_data.seek(0)
+            shutil.copyfileobj(file_data, f, COPY_BUFFER_SIZE)
+        else:
+          if only_changed_files:
+            continue
+          if not os.path.isdir(dir_name):
+            os.makedirs(dir_name)
+          
+          # Need to avoid reading enormous files all at once
+          size_remaining = file_entry.file_size
+          offset_in_file = 0
+          with open(full_file_path, "wb") as f:
+            while size_remaining > 0:
+              size_to_read = min(size_remaining, MAX_DATA_SIZE_TO_READ_AT_ONCE)
+              
               data = read_bytes(iso_file, file_entry.file_data_offset + offset_in_file, size_to_read)
-            f.write(data)
-            
-            size_remaining -= size_to_read
-            offset_in_file += size_to_read
-      
-      files_done += 1
-      yield(file_path, files_done)
+              f.write(data)
+              
+              size_remaining -= size_to_read
+              offset_in_file += size_to_read
+        
+        files_done += 1
+        yield(file_path, files_done)
     
     yield("Done", -1)
   
@@ -639,45 +683,47 @@ class GCM:
     
     files_done = 0
     
-    for file_entry in file_entries_by_data_order:
-      current_file_start_offset = self.output_iso.tell()
-      
-      if file_entry.file_path in self.changed_files:
-        file_data = self.changed_files[file_entry.file_path]
-        file_data.seek(0)
-        self.output_iso.write(file_data.read())
-      else:
-        # Unchanged file.
-        # Most of the game's data falls into this category, so we read the data directly instead of calling read_file_data which would create a BytesIO object, which would add unnecessary performance overhead.
-        # Also, we need to read very large files in chunks to avoid running out of memory.
-        size_remaining = file_entry.file_size
-        offset_in_file = 0
-        while size_remaining > 0:
-          size_to_read = min(size_remaining, MAX_DATA_SIZE_TO_READ_AT_ONCE)
-          
-          with open(self.iso_path, "rb") as iso_file:
+    # The input ISO is opened once for the whole export, rather than once per read.
+    with open(self.iso_path, "rb") as iso_file:
+      for file_entry in file_entries_by_data_order:
+        current_file_start_offset = self.output_iso.tell()
+        
+        if file_entry.file_path in self.changed_files:
+          file_data = self.changed_files[file_entry.file_path]
+          # Streamed in bounded chunks, as the file may have been imported from disk.
+          file_data.seek(0)
+          shutil.copyfileobj(file_data, self.output_iso, COPY_BUFFER_SIZE)
+        else:
+          # Unchanged file.
+          # Most of the game's data falls into this category, so we read the data directly instead of calling read_file_data which would create a BytesIO object, which would add unnecessary performance overhead.
+          # Also, we need to read very large files in chunks to avoid running out of memory.
+          size_remaining = file_entry.file_size
+          offset_in_file = 0
+          while size_remaining > 0:
+            size_to_read = min(size_remaining, MAX_DATA_SIZE_TO_READ_AT_ONCE)
+            
             data = read_bytes(iso_file, file_entry.file_data_offset + offset_in_file, size_to_read)
-          self.output_iso.write(data)
-          
-          size_remaining -= size_to_read
-          offset_in_file += size_to_read
-      
-      file_entry_offset = self.fst_offset + file_entry.file_index*0xC
-      write_u32(self.output_iso, file_entry_offset+4, current_file_start_offset)
-      if file_entry.file_path in self.changed_files:
-        file_size = data_len(self.changed_files[file_entry.file_path])
-      else:
-        file_size = file_entry.file_size
-      write_u32(self.output_iso, file_entry_offset+8, file_size)
-      
-      # Note: The file_data_offset and file_size fields of the FileEntry must not be updated, they refer only to the offset and size of the file data in the input ISO, not this output ISO.
-      
-      self.output_iso.seek(current_file_start_offset + file_size)
-      
-      self.align_output_iso_to_nearest(4)
-      
-      files_done += 1
-      yield(file_entry.file_path, files_done)
+            self.output_iso.write(data)
+            
+            size_remaining -= size_to_read
+            offset_in_file += size_to_read
+        
+        file_entry_offset = self.fst_offset + file_entry.file_index*0xC
+        write_u32(self.output_iso, file_entry_offset+4, current_file_start_offset)
+        if file_entry.file_path in self.changed_files:
+          file_size = data_len(self.changed_files[file_entry.file_path])
+        else:
+          file_size = file_entry.file_size
+        write_u32(self.output_iso, file_entry_offset+8, file_size)
+        
+        # Note: The file_data_offset and file_size fields of the FileEntry must not be updated, they refer only to the offset and size of the file data in the input ISO, not this output ISO.
+        
+        self.output_iso.seek(current_file_start_offset + file_size)
+        
+        self.align_output_iso_to_nearest(4)
+        
+        files_done += 1
+        yield(file_entry.file_path, files_done)
     
     yield("Done", -1)
 